@@ -10,7 +10,7 @@ Description:
 
     Key capabilities:
       • Web search via Tavily
-      • Local file analysis via a C-based file_stats tool (invoked with subprocess)
+      • Local file analysis via a C-based file_stats tool (resident `--serve` subprocess)
       • GitHub operations via an MCP server (Model Context Protocol)
 
     Notes:
@@ -21,15 +21,26 @@ Description:
 from __future__ import annotations
 
 import os
-import json
+import sys
+import atexit
 import logging
 import asyncio
-import subprocess
+from contextlib import AsyncExitStack
+from functools import lru_cache
+from pathlib import Path
 from typing import Annotated, Optional, TypedDict
 
-from langchain_core.messages import BaseMessage
+import httpx
+import orjson
+from langchain_core.messages import (
+    BaseMessage,
+    SystemMessage,
+    ToolMessage,
+    message_chunk_to_message,
+)
 from langgraph.graph.message import add_messages
 from langgraph.graph import StateGraph, END
+from langgraph.types import Send
 from langchain_openai import ChatOpenAI
 from langchain_community.tools.tavily_search import TavilySearch
 
@@ -37,6 +48,15 @@ from langchain_community.tools.tavily_search import TavilySearch
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from langchain_mcp_adapters.tools import load_mcp_tools
 
+# C-based file statistics client (tools/file_stats_tool.py). tools/ sits next
+# to this file in the container image and one level up in a source checkout.
+_here = Path(__file__).resolve().parent
+for _tools_dir in (_here / "tools", _here.parent / "tools"):
+    if _tools_dir.is_dir():
+        sys.path.insert(0, str(_tools_dir))
+        break
+from file_stats_tool import TOOL_TIMEOUT, query_file_stats
+
 # -------------------------------------------------------------
 # Logging
 # -------------------------------------------------------------
@@ -48,37 +68,114 @@ log = logging.getLogger(__name__)
 # -------------------------------------------------------------
 DEFAULT_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 MAX_SEARCH_RESULTS = int(os.getenv("TAVILY_MAX_RESULTS", "3"))
+SYSTEM_PROMPT = os.getenv(
+    "KORRA_SYSTEM_PROMPT",
+    "You are Korra, a helpful AI assistant. Use the available tools for web "
+    "search, local file statistics, and GitHub operations when they help "
+    "answer the user, and summarize tool results clearly.",
+)
+MAX_HISTORY_MESSAGES = int(os.getenv("KORRA_MAX_MESSAGES", "40"))  # 0 keeps everything
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "64"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+
+# -------------------------------------------------------------
+# Shared HTTP client
+# -------------------------------------------------------------
+# One keep-alive connection pool for outbound model calls, so concurrent
+# graph runs reuse warm TLS connections instead of handshaking per request.
+shared_http = httpx.AsyncClient(
+    limits=httpx.Limits(
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    ),
+    timeout=httpx.Timeout(60.0, connect=10.0),
+)
+
+
+@atexit.register
+def _close_shared_http_at_exit() -> None:
+    """Best-effort close of the shared HTTP pool when the interpreter exits."""
+    if shared_http.is_closed:
+        return
+    try:
+        asyncio.run(shared_http.aclose())
+    except Exception as e:
+        log.debug("Shared HTTP client shutdown failed: %s", e)
 
 # -------------------------------------------------------------
 # Graph State
 # -------------------------------------------------------------
+def windowed_add_messages(existing: list[BaseMessage], new) -> list[BaseMessage]:
+    """
+    add_messages, then keep only the most recent MAX_HISTORY_MESSAGES.
+
+    Bounding the list keeps per-turn work (prompt size, checkpoint
+    serialization) constant instead of growing with the conversation. The
+    window never starts on a ToolMessage, since a tool result whose AI tool
+    call was trimmed away would be rejected by the model provider.
+    """
+    merged = add_messages(existing, new)
+    if MAX_HISTORY_MESSAGES <= 0 or len(merged) <= MAX_HISTORY_MESSAGES:
+        return merged
+
+    start = len(merged) - MAX_HISTORY_MESSAGES
+    while start < len(merged) and isinstance(merged[start], ToolMessage):
+        start += 1
+    return merged[start:]
+
+
 class State(TypedDict):
     """
     State schema for the Korra graph used by LangGraph Studio.
 
     LangGraph Studio's message composer automatically manages this state,
-    adding new messages and preserving full conversation history across
-    interactions. The add_messages merge policy ensures that messages are
-    appended rather than replaced.
+    adding new messages and preserving recent conversation history across
+    interactions. The windowed_add_messages merge policy ensures that
+    messages are appended rather than replaced, and that only the latest
+    MAX_HISTORY_MESSAGES (env KORRA_MAX_MESSAGES) are retained.
 
     Fields:
-        messages: Full conversation history (Human and AI messages).
+        messages: Recent conversation history (Human, AI and tool messages).
                   Studio displays this in the state inspector, allowing
                   developers to see how context is maintained across turns.
     """
-    messages: Annotated[list[BaseMessage], add_messages]
+    messages: Annotated[list[BaseMessage], windowed_add_messages]
+
+
+class ToolCallState(TypedDict):
+    """
+    Per-call payload delivered to a tool node through the Send API.
+
+    When the model requests several tools in one turn, route_tools fans the
+    calls out so each tool node runs concurrently on its own call.
+
+    Fields:
+        messages:  Conversation history at the time the calls were issued.
+        tool_call: The single tool call (name / args / id) this node handles.
+    """
+    messages: list[BaseMessage]
+    tool_call: dict
 
 
 # ============================================================
 # MCP SERVER INITIALIZATION
 # ============================================================
 
-async def build_mcp_tools() -> list:
+# Process-wide MCP state. Spawning the GitHub MCP server (npx) and completing
+# the handshake takes seconds, so one session, its tools, and the tool-bound
+# model are created once and reused by every graph invocation. The session is
+# owned by a single background task (see _own_mcp_session).
+_mcp_cache: dict = {}
+_mcp_lock = asyncio.Lock()
+
+
+async def _own_mcp_session(ready: asyncio.Future, stop: asyncio.Event) -> None:
     """
-    Build tools dynamically from an MCP server configuration.
+    Open the GitHub MCP session, publish its tools, and hold it until `stop`.
 
-    This loads tool definitions at runtime so the agent can call external
-    capabilities (e.g., GitHub operations) without hard-coding each tool.
+    The MCP stdio transport runs on anyio task groups, which must be exited
+    by the task that entered them, so this one long-lived task both enters
+    the session's AsyncExitStack and closes it.
     """
     github_token = os.getenv("GITHUB_TOKEN")
 
@@ -86,137 +183,396 @@ async def build_mcp_tools() -> list:
     # Note: keep tokens in env vars; do not commit them to the repo.
     mcp_config = {
         "github": {
+            "transport": "stdio",
             "command": "npx",
             "args": ["-y", "@modelcontextprotocol/server-github"],
             "env": {"GITHUB_TOKEN": github_token} if github_token else {},
         }
     }
 
-    client = MultiServerMCPClient(mcp_config)
+    stack = AsyncExitStack()
+    try:
+        client = MultiServerMCPClient(mcp_config)
+        session = await stack.enter_async_context(client.session("github"))
+
+        # Load MCP tool wrappers bound to the open session ("tools" last: the
+        # fast path in build_mcp_tools keys on it)
+        tools = await load_mcp_tools(session)
+        _mcp_cache["stack"] = stack
+        _mcp_cache["tools_by_name"] = {t.name: t for t in tools}
+        _mcp_cache["tools"] = tools
+        log.info("MCP session started with %d tools", len(tools))
+        ready.set_result(tools)
+
+        await stop.wait()
+    except asyncio.CancelledError:
+        if not ready.done():
+            ready.cancel()
+        raise
+    except Exception as e:
+        # Reported to whoever is waiting on `ready`; the next call retries
+        if not ready.done():
+            ready.set_exception(e)
+        else:
+            log.warning("MCP session failed: %s", e)
+    finally:
+        for key in ("tools", "tools_by_name", "llm", "stack"):
+            _mcp_cache.pop(key, None)
+        await stack.aclose()
+
+
+async def build_mcp_tools() -> list:
+    """
+    Build tools dynamically from an MCP server configuration.
+
+    This loads tool definitions at runtime so the agent can call external
+    capabilities (e.g., GitHub operations) without hard-coding each tool.
+    The first call starts the session-owning task and waits for its tools;
+    later calls reuse the same session.
+    """
+    # Fast path: no lock needed once the cache is populated
+    if "tools" in _mcp_cache:
+        return _mcp_cache["tools"]
+
+    async with _mcp_lock:
+        task = _mcp_cache.get("task")
+        if task is None or task.done():
+            ready = asyncio.get_running_loop().create_future()
+            stop = asyncio.Event()
+            _mcp_cache["ready"] = ready
+            _mcp_cache["stop"] = stop
+            _mcp_cache["task"] = asyncio.create_task(_own_mcp_session(ready, stop))
+
+        # Shielded so a cancelled caller does not cancel the shared startup
+        return await asyncio.shield(_mcp_cache["ready"])
+
+
+async def build_mcp_llm(llm: ChatOpenAI):
+    """
+    Return `llm` bound to the MCP tools, binding only on the first call.
+    """
+    if "llm" in _mcp_cache:
+        return _mcp_cache["llm"]
+
+    tools = await build_mcp_tools()
+    async with _mcp_lock:
+        if "llm" not in _mcp_cache:
+            # (Depending on your LangChain version, binding may vary.)
+            _mcp_cache["llm"] = llm.bind_tools(tools)
+        return _mcp_cache["llm"]
+
+
+async def run_mcp_tool_calls(tool_calls: list[dict]) -> list[ToolMessage]:
+    """
+    Execute MCP tool calls concurrently and return one ToolMessage per call.
+
+    Calls are awaited together with asyncio.gather, so N GitHub requests
+    finish in the time of the slowest one rather than their sum. Results
+    come back in call order, each keyed by its tool_call_id; unknown tools
+    and raised exceptions become error messages instead of failing the batch.
+    """
+    await build_mcp_tools()
+    tools_by_name = _mcp_cache["tools_by_name"]
+
+    async def run(tool_call: dict) -> ToolMessage:
+        mcp_tool = tools_by_name.get(tool_call["name"])
+        if mcp_tool is None:
+            return tool_result(tool_call, f"Unknown MCP tool: {tool_call['name']}", "error")
+        try:
+            # Invoking with the full tool call returns a ToolMessage carrying its id
+            return await mcp_tool.ainvoke(tool_call)
+        except Exception as e:
+            log.warning("MCP tool %s failed: %s", tool_call["name"], e)
+            return tool_result(tool_call, f"{type(e).__name__}: {e}", "error")
+
+    return list(await asyncio.gather(*(run(tc) for tc in tool_calls)))
+
+
+async def close_mcp_tools() -> None:
+    """
+    Shut down the MCP session (and its server subprocess), if any.
+
+    Signals the owning task to close its exit stack and waits for it, so
+    the session is torn down on the task that opened it.
+    """
+    async with _mcp_lock:
+        task = _mcp_cache.pop("task", None)
+        stop = _mcp_cache.pop("stop", None)
+        _mcp_cache.pop("ready", None)
+    if task is None:
+        return
+    stop.set()
+    await asyncio.wait([task])
+
+
+# ============================================================
+# LLM STREAMING
+# ============================================================
+
+async def astream_message(model, messages: list[BaseMessage]) -> BaseMessage:
+    """
+    Run `model` with astream and merge the chunks into one message.
+
+    Streaming lets LangGraph forward tokens (stream_mode="messages") as soon
+    as the provider emits them instead of after the whole completion, while
+    the node still returns a single complete message (with merged
+    tool_calls) for routing.
+    """
+    final = None
+    async for chunk in model.astream(messages):
+        final = chunk if final is None else final + chunk
+    return message_chunk_to_message(final)
+
+
+# ============================================================
+# TOOL ROUTING
+# ============================================================
 
-    # Load MCP tool wrappers
-    tools = await load_mcp_tools(client)
-    return tools
+# Exact tool name -> graph node that executes it
+TOOL_ROUTES = {
+    "tavily_search": "tavily_tool",
+    "tavily_search_results_json": "tavily_tool",
+    "analyze_file_statistics": "file_stats_tool",
+    "file_stats": "file_stats_tool",
+}
+
+# Fallback for other names: the first fragment contained in the name wins
+TOOL_ROUTE_FRAGMENTS = (
+    ("tavily", "tavily_tool"),
+    ("file", "file_stats_tool"),
+    ("stats", "file_stats_tool"),
+    ("github", "github_mcp_tool"),
+)
+
+
+@lru_cache(maxsize=256)
+def tool_node_for(name: str) -> Optional[str]:
+    """
+    Map a tool name to the graph node that executes it (None if unknown).
+
+    Known names are a single dict lookup; fragment matches are memoized, so
+    each distinct name is only scanned once per process.
+    """
+    name = name.lower()
+    node = TOOL_ROUTES.get(name)
+    if node is None:
+        node = next((n for frag, n in TOOL_ROUTE_FRAGMENTS if frag in name), None)
+    return node
 
 
 # ============================================================
 # TOOL NODES
 # ============================================================
 
+def tool_result(tool_call: dict, content: str, status: str = "success") -> ToolMessage:
+    """
+    Wrap a tool node's output as the ToolMessage answering `tool_call`.
+
+    The tool_call_id lets the model (and LangGraph) pair each result with
+    the call that produced it, which matters once calls run in parallel.
+    """
+    return ToolMessage(
+        content=content,
+        tool_call_id=tool_call["id"],
+        name=tool_call.get("name"),
+        status=status,
+    )
+
+
+def file_stats_status(lines: list[bytes]) -> str:
+    """
+    Derive the ToolMessage status from raw file_stats JSON lines.
+
+    Each line is one object, or an array for a directory. The call counts as
+    an error only when every reported entry has "status": "error" (e.g. all
+    requested paths are missing); partial failures stay "success" and are
+    visible per entry in the content.
+    """
+    entries = []
+    for line in lines:
+        value = orjson.loads(line)
+        entries.extend(value if isinstance(value, list) else [value])
+    if entries and all(entry.get("status") == "error" for entry in entries):
+        return "error"
+    return "success"
+
+
 def initialize_korra() -> StateGraph:
     """
     Build and return a compiled LangGraph StateGraph for the Korra AI agent.
 
     Nodes:
-      - agent: Primary LLM node with tool calling enabled.
-      - tavily_tool: Web search tool node (sync).
-      - file_stats_tool: Local C-based file statistics tool node (subprocess).
+      - agent: Primary LLM node with tool calling enabled (streamed).
+      - tavily_tool: Web search tool node (async).
+      - file_stats_tool: Local C-based file statistics tool node (resident subprocess).
       - github_mcp_tool: Async node to execute MCP tools (GitHub).
+      - unknown_tool: Answers tool calls no other node handles with an error.
 
     Returns:
         A compiled graph ready for Studio / local execution.
     """
     # Initialize the language model
-    llm = ChatOpenAI(model=DEFAULT_MODEL, temperature=0.7)
+    llm = ChatOpenAI(
+        model=DEFAULT_MODEL,
+        temperature=0.7,
+        streaming=True,
+        http_async_client=shared_http,
+    )
 
     # Initialize the web search tool for real-time information retrieval
     tavily_tool = TavilySearch(max_results=MAX_SEARCH_RESULTS)
 
+    # Bind the agent's tools once; bind_tools converts every tool schema, so
+    # doing it per turn would rebuild identical request payloads each time.
+    agent_llm = llm.bind_tools([tavily_tool])
+
+    # Static system prompt sent ahead of the conversation on every model call.
+    # Together with the tool schema it forms a byte-identical prompt prefix
+    # across turns, which OpenAI's automatic prompt caching reuses.
+    system_message = SystemMessage(content=SYSTEM_PROMPT)
+
     # Initialize the local C-based file statistics tool
-    # Expected executable: ./file_stats (or adjust as needed)
-    file_stats_exe = os.getenv("FILE_STATS_EXE", "./file_stats")
+    # Default executable: the one built next to tools/file_stats_tool.py
+    file_stats_exe = os.getenv("FILE_STATS_EXE")
 
     # ---------------------------------------------------------
     # Tool node: Tavily
     # ---------------------------------------------------------
-    def tavily__tool(state: State) -> dict[str, list[BaseMessage]]:
+    async def tavily__tool(state: ToolCallState) -> dict[str, list[BaseMessage]]:
         """
-        Execute web search tool calls.
+        Execute a web search tool call.
 
-        This node runs synchronous tool calls that do not require async handling.
+        Uses the tool's async entry point so the HTTP round trip overlaps with
+        other graph work instead of blocking the event loop (LangChain runs
+        tools without native async support in a worker thread).
+
+        Invoking the tool with the whole tool call makes LangChain return a
+        ToolMessage already keyed to the call's id.
         """
-        result = tavily_tool.invoke(state["messages"][-1].content)
+        result = await tavily_tool.ainvoke(state["tool_call"])
         return {"messages": [result]}
 
     # ---------------------------------------------------------
     # Tool node: File stats (C program)
     # ---------------------------------------------------------
-    def file_stats__tool(state: State) -> dict[str, list[BaseMessage]]:
+    async def file_stats__tool(state: ToolCallState) -> dict[str, list[BaseMessage]]:
         """
-        Execute C-based file statistics tool calls.
+        Execute a C-based file statistics tool call.
 
-        This node invokes a compiled C program via subprocess, demonstrating
-        cross-language integration. Keeping file analysis behind a dedicated
+        This node talks to the resident `file_stats --serve` process shared
+        with tools/file_stats_tool.py over a pipe, so each call costs a pipe
+        round trip instead of a process spawn and never blocks the event loop
+        shared by other graph runs. Keeping file analysis behind a dedicated
         node makes it easy to debug subprocess execution and output parsing.
+
+        Accepts either a single `filename` or a `filenames` list (files or
+        directories); a batch is analyzed in one pipelined request.
         """
-        prompt = state["messages"][-1].content
+        tool_call = state["tool_call"]
+        args = tool_call["args"]
+        paths = [str(p) for p in args.get("filenames") or [args.get("filename", "")]]
 
         try:
-            # Invoke the C tool. Adjust CLI args to match your C program contract.
-            proc = subprocess.run(
-                [file_stats_exe, prompt],
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-
-            if proc.returncode != 0:
-                msg = f"file_stats tool error (rc={proc.returncode}): {proc.stderr.strip()}"
+            try:
+                lines = await query_file_stats(paths, file_stats_exe)
+            except asyncio.TimeoutError:
+                msg = f"file_stats tool timed out after {TOOL_TIMEOUT}s"
                 log.warning(msg)
-                return {"messages": [msg]}
+                return {"messages": [tool_result(tool_call, msg, "error")]}
 
-            out = proc.stdout.strip()
+            outs = [line.decode(errors="replace").strip() for line in lines]
+            status = file_stats_status(lines)
 
-            # If the tool returns JSON, keep it as JSON; otherwise pass raw.
-            try:
-                parsed = json.loads(out)
-                return {"messages": [json.dumps(parsed, indent=2)]}
-            except Exception:
-                return {"messages": [out]}
+            # The C tool emits valid JSON (one object, or an array for a
+            # directory), so it is passed through without a re-dump.
+            if len(outs) == 1:
+                return {"messages": [tool_result(tool_call, outs[0], status)]}
+
+            # Splice the per-path values into one flat array
+            items = [out[1:-1].strip() if out.startswith("[") else out for out in outs]
+            out = "[" + ", ".join(item for item in items if item) + "]"
+            return {"messages": [tool_result(tool_call, out, status)]}
 
-        except FileNotFoundError:
-            msg = f"file_stats executable not found: {file_stats_exe}"
+        except FileNotFoundError as e:
+            msg = f"file_stats executable not found: {e.filename}"
             log.error(msg)
-            return {"messages": [msg]}
+            return {"messages": [tool_result(tool_call, msg, "error")]}
         except Exception as e:
             msg = f"file_stats tool exception: {type(e).__name__}: {e}"
             log.exception(msg)
-            return {"messages": [msg]}
+            return {"messages": [tool_result(tool_call, msg, "error")]}
 
     # ---------------------------------------------------------
     # Tool node: GitHub MCP (async)
     # ---------------------------------------------------------
-    async def github_mcp__tool(state: State) -> dict[str, list[BaseMessage]]:
+    async def github_mcp__tool(state: ToolCallState) -> dict[str, list[BaseMessage]]:
         """
         Execute MCP tool calls asynchronously (e.g., GitHub operations).
 
         This node is async because MCP calls may involve network I/O and
-        dynamic tool selection at runtime.
+        dynamic tool selection at runtime. The MCP-bound model picks the
+        concrete GitHub calls; all of them run concurrently and their
+        results are returned together as the answer to this node's call.
         """
-        mcp_tools = await build_mcp_tools()
+        tool_call = state["tool_call"]
 
         # Bind MCP tools to the model for tool calling behavior.
-        # (Depending on your LangChain version, binding may vary.)
-        mcp_llm = llm.bind_tools(mcp_tools)
+        # The MCP session and bound model are shared across invocations.
+        mcp_llm = await build_mcp_llm(llm)
+
+        # Leave out the agent message that issued this call: its tool calls
+        # are still unanswered, which the model API rejects.
+        history = state["messages"]
+        if history and getattr(history[-1], "tool_calls", None):
+            history = history[:-1]
+
+        response = await astream_message(mcp_llm, [system_message, *history])
+        if not response.tool_calls:
+            return {"messages": [tool_result(tool_call, response.content)]}
+
+        results = await run_mcp_tool_calls(response.tool_calls)
+        out = orjson.dumps(
+            [
+                {
+                    "tool": msg.name,
+                    "tool_call_id": msg.tool_call_id,
+                    "status": msg.status,
+                    "content": msg.content,
+                }
+                for msg in results
+            ],
+            default=str,
+        ).decode()
+        status = "error" if all(msg.status == "error" for msg in results) else "success"
+        return {"messages": [tool_result(tool_call, out, status)]}
 
-        response = await mcp_llm.ainvoke(state["messages"])
-        return {"messages": [response]}
+    # ---------------------------------------------------------
+    # Tool node: unknown tools
+    # ---------------------------------------------------------
+    async def unknown__tool(state: ToolCallState) -> dict[str, list[BaseMessage]]:
+        """
+        Answer a tool call that no node handles with an error result.
+
+        Every tool call id must get a ToolMessage before the next model
+        call, otherwise the provider rejects the conversation.
+        """
+        tool_call = state["tool_call"]
+        msg = f"Unknown tool: {tool_call.get('name')}"
+        log.warning("No tool node for tool call: %s", tool_call.get("name"))
+        return {"messages": [tool_result(tool_call, msg, "error")]}
 
     # ---------------------------------------------------------
     # Agent node
     # ---------------------------------------------------------
-    def agent(state: State) -> dict[str, list[BaseMessage]]:
+    async def agent(state: State) -> dict[str, list[BaseMessage]]:
         """
         Main LLM node.
 
         The model is bound to the locally available tools. Tool routing is
         handled by the graph's conditional edges based on the requested action.
+        The completion is streamed so clients see tokens as they arrive.
         """
-        # Combine all available tools for LLM binding (sync tools only here)
-        tools_for_binding = [tavily_tool]
-        agent_llm = llm.bind_tools(tools_for_binding)
-
-        response = agent_llm.invoke(state["messages"])
+        response = await astream_message(agent_llm, [system_message, *state["messages"]])
         return {"messages": [response]}
 
     # ============================================================
@@ -231,48 +587,81 @@ def initialize_korra() -> StateGraph:
     # Async node wrapper for MCP:
     # LangGraph supports async nodes; we expose it as a node name here.
     graph_builder.add_node("github_mcp_tool", github_mcp__tool)
+    graph_builder.add_node("unknown_tool", unknown__tool)
 
     # ---------------------------------------------------------
     # Routing logic
     # ---------------------------------------------------------
-    def route_tools(state: State) -> str:
+    def route_tools(state: State) -> list[Send] | str:
         """
-        Decide which node to route to based on the latest message.
+        Decide which node(s) to route to based on the latest message.
 
-        You can make this smarter by inspecting tool_calls metadata.
-        This is intentionally simple and readable.
+        Every tool call on the last message is sent to its tool node as a
+        separate Send, so independent tools requested in the same turn run
+        in parallel and their results are merged back by add_messages.
+        Calls with no matching node go to unknown_tool, so each one still
+        gets an answer.
         """
         last = state["messages"][-1]
 
         # If LangChain tool calling is used, tool calls may be available here.
         tool_calls = getattr(last, "tool_calls", None) or []
 
-        if tool_calls:
-            # Route based on tool name
-            name = tool_calls[0].get("name", "").lower()
-            if "tavily" in name:
-                return "tavily_tool"
-            if "file" in name or "stats" in name:
-                return "file_stats_tool"
-            if "github" in name:
-                return "github_mcp_tool"
+        sends = []
+        for tool_call in tool_calls:
+            node = tool_node_for(tool_call.get("name", "")) or "unknown_tool"
+            sends.append(Send(node, {"messages": state["messages"], "tool_call": tool_call}))
 
-        # Fallback routing: keep conversation in the agent loop
-        return END
+        # Fallback routing: no tools requested, so the turn is over
+        return sends or END
 
-    # Agent decides, then we route to a tool node (or end)
+    # Agent decides, then we fan out to tool nodes (or end)
     graph_builder.set_entry_point("agent")
-    graph_builder.add_conditional_edges("agent", route_tools)
+    graph_builder.add_conditional_edges(
+        "agent",
+        route_tools,
+        ["tavily_tool", "file_stats_tool", "github_mcp_tool", "unknown_tool", END],
+    )
 
     # Tool nodes return control to the agent for the next step
     graph_builder.add_edge("tavily_tool", "agent")
     graph_builder.add_edge("file_stats_tool", "agent")
     graph_builder.add_edge("github_mcp_tool", "agent")
+    graph_builder.add_edge("unknown_tool", "agent")
 
     # Compile and return the graph
     return graph_builder.compile()
 
 
+# ============================================================
+# SERVER LIFECYCLE
+# ============================================================
+
+async def warmup_korra() -> None:
+    """
+    Pre-start slow dependencies so the first user turn finds them hot.
+
+    Spawns the GitHub MCP server and loads its tools. Failures are logged
+    rather than raised so a missing token or npx never blocks startup; the
+    first GitHub call will simply retry.
+    """
+    try:
+        await build_mcp_tools()
+    except Exception as e:
+        log.warning("MCP warmup failed (will retry on first use): %s", e)
+
+
+async def shutdown_korra() -> None:
+    """
+    Release process-wide resources: the MCP session and the HTTP pool.
+    """
+    try:
+        await close_mcp_tools()
+    except Exception as e:
+        log.warning("MCP session shutdown failed: %s", e)
+    await shared_http.aclose()
+
+
 # Create the graph instance that Studio will discover and load
 graph = initialize_korra()
 
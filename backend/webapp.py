@@ -0,0 +1,50 @@
+"""
+File: webapp.py
+Project: Korra AI Agent
+Author: Yousif Faraj
+
+Description:
+    Custom ASGI app mounted by the LangGraph server (see "http.app" in
+    langgraph.json). It adds no routes; it only hooks the server lifespan
+    so that slow dependencies are warmed up at startup and released at
+    shutdown.
+
+    The graph is registered by module name ("graph:graph") rather than by
+    file path, so the server and this app share one `graph` module and
+    therefore one MCP cache.
+
+    Startup:
+      • Starts the GitHub MCP server in the background (warmup_korra), so
+        the first user turn does not pay the npx spawn + MCP handshake.
+
+    Shutdown:
+      • Closes the MCP session and the shared HTTP pool (shutdown_korra).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+
+from starlette.applications import Starlette
+
+from graph import shutdown_korra, warmup_korra
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: Starlette):
+    """
+    Warm up in the background so the server becomes ready immediately;
+    requests that arrive before warmup finishes wait on the MCP cache lock.
+    """
+    warmup = asyncio.create_task(warmup_korra())
+    try:
+        yield
+    finally:
+        warmup.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await warmup
+        await shutdown_korra()
+
+
+app = Starlette(lifespan=lifespan)
@@ -17,6 +17,19 @@
  *       • characters (including whitespace)
  *       • size_bytes (file size)
  *
+ *     Several paths, or a directory, can be analyzed in one run; the result
+ *     is then a JSON array with one object per file. Directory entries are
+ *     enumerated with readdir and inspected with fstatat/openat relative to
+ *     the directory fd, so no full path is re-resolved per file (POSIX only).
+ *
+ *     Counting is done 32 bytes at a time with AVX2 when the CPU supports it
+ *     (checked at runtime on x86 with GCC/Clang), 16 bytes at a time with
+ *     NEON on ARM, and byte by byte otherwise. All paths give identical
+ *     results; no extra compiler flags are needed.
+ *
+ *     Files are memory-mapped (mmap on POSIX, MapViewOfFile on Windows) so
+ *     the kernels scan the page cache directly with no read() copies.
+ *
  * Compilation:
  *     Windows:
  *         gcc -Wall -Wextra -std=c11 -O2 -o file_stats.exe file_stats.c
@@ -26,13 +39,54 @@
  *
  * Usage:
  *     ./file_stats <filename>
+ *     ./file_stats <path> [<path> ...]   (JSON array; directories are expanded)
+ *     ./file_stats --serve
+ *
+ *     In --serve mode the program stays resident, reading one path per line
+ *     from stdin and writing one compact JSON value per line to stdout
+ *     (flushed after every result). This lets a wrapper keep a single
+ *     process open instead of paying fork+exec for every file.
  * ============================================================
  */
 
+#ifndef _WIN32
+#define _POSIX_C_SOURCE 200809L  /* dirfd, openat, fstatat, posix_madvise */
+#endif
+
 #include <stdio.h>
 #include <stdlib.h>
 #include <string.h>
 #include <ctype.h>
+#include <stdint.h>
+#include <sys/stat.h>
+
+#if (defined(__x86_64__) || defined(__i386__)) && (defined(__GNUC__) || defined(__clang__))
+#define HAVE_AVX2_KERNEL 1
+#include <immintrin.h>
+#elif defined(__ARM_NEON) && defined(__aarch64__)  /* vaddvq_u8 is AArch64-only */
+#define HAVE_NEON_KERNEL 1
+#include <arm_neon.h>
+#endif
+
+#ifdef _WIN32
+#include <windows.h>
+#else
+#include <dirent.h>
+#include <fcntl.h>
+#include <limits.h>
+#include <sys/mman.h>
+#include <unistd.h>
+#endif
+
+#ifndef PATH_MAX
+#define PATH_MAX 4096
+#endif
+
+/* Longest path accepted on a --serve request line (including newline). */
+#define SERVE_LINE_MAX 4096
+
+/* Size of the read buffer used when a file cannot be memory-mapped. */
+#define READ_CHUNK (64 * 1024)
 
 /* ============================================================
  * DATA STRUCTURES
@@ -60,6 +114,39 @@ typedef struct {
  * JSON OUTPUT FUNCTIONS
  * ============================================================ */
 
+/**
+ * Print a string as a quoted JSON string literal.
+ *
+ * Escapes quotes, backslashes (e.g., Windows paths) and control
+ * characters so the output is always valid JSON and the Python wrapper
+ * can parse it without any pre-processing.
+ *
+ * Parameters:
+ *     str - NUL-terminated string to print
+ *
+ * Returns:
+ *     None (outputs to stdout)
+ */
+void print_json_string(const char *str) {
+    putchar('"');
+    for (const unsigned char *p = (const unsigned char *)str; *p != '\0'; p++) {
+        switch (*p) {
+            case '"':  fputs("\\\"", stdout); break;
+            case '\\': fputs("\\\\", stdout); break;
+            case '\n': fputs("\\n", stdout); break;
+            case '\r': fputs("\\r", stdout); break;
+            case '\t': fputs("\\t", stdout); break;
+            default:
+                if (*p < 0x20) {
+                    printf("\\u%04x", *p);
+                } else {
+                    putchar(*p);
+                }
+        }
+    }
+    putchar('"');
+}
+
 /**
  * Output successful analysis results in JSON format.
  *
@@ -67,21 +154,27 @@ typedef struct {
  * can be parsed by the Python wrapper for integration with LangGraph.
  *
  * Parameters:
- *     stats - Pointer to FileStats structure containing results
+ *     stats   - Pointer to FileStats structure containing results
+ *     compact - Non-zero to print the object on a single line (--serve mode)
  *
  * Returns:
  *     None (outputs to stdout)
  */
-void output_langgraph_json(const FileStats *stats) {
-    printf("{\n");
-    printf("  \"tool\": \"file_stats\",\n");
-    printf("  \"filename\": \"%s\",\n", stats->filename);
-    printf("  \"lines\": %ld,\n", stats->lines);
-    printf("  \"words\": %ld,\n", stats->words);
-    printf("  \"characters\": %ld,\n", stats->characters);
-    printf("  \"size_bytes\": %ld,\n", stats->size_bytes);
-    printf("  \"status\": \"success\"\n");
-    printf("}\n");
+void output_langgraph_json(const FileStats *stats, int compact) {
+    const char *nl = compact ? "" : "\n";
+    const char *in = compact ? " " : "  ";
+
+    printf("{%s", nl);
+    printf("%s\"tool\": \"file_stats\",%s", in, nl);
+    printf("%s\"filename\": ", in);
+    print_json_string(stats->filename);
+    printf(",%s", nl);
+    printf("%s\"lines\": %ld,%s", in, stats->lines, nl);
+    printf("%s\"words\": %ld,%s", in, stats->words, nl);
+    printf("%s\"characters\": %ld,%s", in, stats->characters, nl);
+    printf("%s\"size_bytes\": %ld,%s", in, stats->size_bytes, nl);
+    printf("%s\"status\": \"success\"%s", in, nl);
+    printf("}");
 }
 
 /**
@@ -92,16 +185,186 @@ void output_langgraph_json(const FileStats *stats) {
  *
  * Parameters:
  *     error_msg - Error message string to output
+ *     filename  - Path the error refers to, or NULL if not path-specific
+ *     compact   - Non-zero to print the object on a single line (--serve mode)
+ *
+ * Returns:
+ *     None (outputs to stdout)
+ */
+void output_error_json(const char *error_msg, const char *filename, int compact) {
+    const char *nl = compact ? "" : "\n";
+    const char *in = compact ? " " : "  ";
+
+    printf("{%s", nl);
+    printf("%s\"tool\": \"file_stats\",%s", in, nl);
+    if (filename != NULL) {
+        printf("%s\"filename\": ", in);
+        print_json_string(filename);
+        printf(",%s", nl);
+    }
+    printf("%s\"error\": ", in);
+    print_json_string(error_msg);
+    printf(",%s", nl);
+    printf("%s\"status\": \"error\"%s", in, nl);
+    printf("}");
+}
+
+/**
+ * Print the separator that precedes the next element of a JSON array.
+ *
+ * Parameters:
+ *     compact - Non-zero when the whole array is kept on one line
+ *     count   - Number of elements printed so far (incremented here)
  *
  * Returns:
  *     None (outputs to stdout)
  */
-void output_error_json(const char *error_msg) {
-    printf("{\n");
-    printf("  \"tool\": \"file_stats\",\n");
-    printf("  \"error\": \"%s\",\n", error_msg);
-    printf("  \"status\": \"error\"\n");
-    printf("}\n");
+void begin_array_element(int compact, int *count) {
+    if (*count > 0) {
+        printf(compact ? ", " : ",");
+    }
+    if (!compact) {
+        printf("\n  ");
+    }
+    (*count)++;
+}
+
+/* ============================================================
+ * COUNTING KERNELS
+ * ============================================================
+ *
+ * Every kernel scans a buffer and adds to stats->lines / stats->words.
+ * A word starts at each non-whitespace byte whose predecessor is
+ * whitespace (or is the start of the file), matching isspace() in the
+ * C locale: ' ', '\t', '\n', '\v', '\f', '\r'. prev_space carries the
+ * state of the last byte across buffer (and kernel) boundaries.
+ */
+
+/**
+ * Byte-at-a-time kernel; also handles the tails left by the SIMD kernels.
+ */
+void count_scalar(const unsigned char *p, size_t n, FileStats *stats, int *prev_space) {
+    for (size_t i = 0; i < n; i++) {
+        int space = isspace(p[i]) != 0;
+
+        // Count line breaks
+        if (p[i] == '\n') {
+            stats->lines++;
+        }
+
+        // Word counting: transition from whitespace to non-whitespace
+        if (!space && *prev_space) {
+            stats->words++;
+        }
+        *prev_space = space;
+    }
+}
+
+#ifdef HAVE_AVX2_KERNEL
+/**
+ * AVX2 kernel: 32 bytes per iteration.
+ *
+ * Newlines are counted with cmpeq + movemask + popcount. The whitespace
+ * mask is shifted left by one (pulling in the previous block's last bit)
+ * so that (~space & prev_space) marks exactly the word starts.
+ *
+ * Returns:
+ *     Number of bytes consumed (a multiple of 32)
+ */
+__attribute__((target("avx2,popcnt")))
+size_t count_avx2(const unsigned char *p, size_t n, FileStats *stats, int *prev_space) {
+    const __m256i newline = _mm256_set1_epi8('\n');
+    const __m256i blank = _mm256_set1_epi8(' ');
+    const __m256i tab = _mm256_set1_epi8('\t');
+    const __m256i four = _mm256_set1_epi8(4);
+    uint32_t carry = (uint32_t)*prev_space;
+    size_t i = 0;
+
+    for (; i + 32 <= n; i += 32) {
+        __m256i v = _mm256_loadu_si256((const __m256i *)(p + i));
+
+        uint32_t nl = (uint32_t)_mm256_movemask_epi8(_mm256_cmpeq_epi8(v, newline));
+
+        // '\t'..'\r' are 9..13: (v - 9) <= 4 as unsigned bytes
+        __m256i ctrl = _mm256_sub_epi8(v, tab);
+        __m256i is_ctrl = _mm256_cmpeq_epi8(_mm256_min_epu8(ctrl, four), ctrl);
+        __m256i is_space = _mm256_or_si256(is_ctrl, _mm256_cmpeq_epi8(v, blank));
+        uint32_t sp = (uint32_t)_mm256_movemask_epi8(is_space);
+
+        uint32_t starts = ~sp & ((sp << 1) | carry);
+
+        stats->lines += __builtin_popcount(nl);
+        stats->words += __builtin_popcount(starts);
+        carry = sp >> 31;
+    }
+
+    *prev_space = (int)carry;
+    return i;
+}
+#endif
+
+#ifdef HAVE_NEON_KERNEL
+/**
+ * NEON kernel: 16 bytes per iteration.
+ *
+ * vextq_u8 splices the previous block's whitespace lanes in front of the
+ * current ones, giving each byte its predecessor's whitespace flag.
+ *
+ * Returns:
+ *     Number of bytes consumed (a multiple of 16)
+ */
+size_t count_neon(const unsigned char *p, size_t n, FileStats *stats, int *prev_space) {
+    const uint8x16_t newline = vdupq_n_u8('\n');
+    const uint8x16_t blank = vdupq_n_u8(' ');
+    const uint8x16_t tab = vdupq_n_u8('\t');
+    const uint8x16_t four = vdupq_n_u8(4);
+    const uint8x16_t one = vdupq_n_u8(1);
+    uint8x16_t prev = vdupq_n_u8(*prev_space ? 0xFF : 0);
+    size_t i = 0;
+
+    for (; i + 16 <= n; i += 16) {
+        uint8x16_t v = vld1q_u8(p + i);
+
+        uint8x16_t nl = vceqq_u8(v, newline);
+        uint8x16_t sp = vorrq_u8(vcleq_u8(vsubq_u8(v, tab), four), vceqq_u8(v, blank));
+        uint8x16_t before = vextq_u8(prev, sp, 15);
+        uint8x16_t starts = vbicq_u8(before, sp);
+
+        stats->lines += vaddvq_u8(vandq_u8(nl, one));
+        stats->words += vaddvq_u8(vandq_u8(starts, one));
+        prev = sp;
+    }
+
+    *prev_space = vgetq_lane_u8(prev, 15) != 0;
+    return i;
+}
+#endif
+
+/**
+ * Count lines and words in a buffer using the fastest available kernel.
+ *
+ * Parameters:
+ *     p          - Buffer to scan
+ *     n          - Number of bytes in the buffer
+ *     stats      - Statistics to add to
+ *     prev_space - Whitespace state of the byte before p (updated)
+ *
+ * Returns:
+ *     None
+ */
+void count_buffer(const unsigned char *p, size_t n, FileStats *stats, int *prev_space) {
+    size_t done = 0;
+
+#if defined(HAVE_AVX2_KERNEL)
+    if (__builtin_cpu_supports("avx2")) {
+        done = count_avx2(p, n, stats, prev_space);
+    }
+#elif defined(HAVE_NEON_KERNEL)
+    done = count_neon(p, n, stats, prev_space);
+#endif
+
+    count_scalar(p + done, n - done, stats, prev_space);
+    stats->characters += (long)n;
 }
 
 /* ============================================================
@@ -109,20 +372,23 @@ void output_error_json(const char *error_msg) {
  * ============================================================ */
 
 /**
- * Analyze a text file and compute statistics.
- *
- * Performs character-by-character analysis to count lines, words,
- * and characters. Uses fseek/ftell to determine file size efficiently.
+ * Reset stats and record the reported filename.
+ */
+void init_stats(FileStats *stats, const char *filename) {
+    stats->lines = 0;
+    stats->words = 0;
+    stats->characters = 0;
+    stats->size_bytes = 0;
+    strncpy(stats->filename, filename, sizeof(stats->filename) - 1);
+    stats->filename[sizeof(stats->filename) - 1] = '\0';
+}
+
+#ifdef _WIN32
+/**
+ * Analyze a text file and compute statistics (Windows).
  *
- * Algorithm:
- *     1. Open file for reading
- *     2. Use fseek/ftell to get file size
- *     3. Rewind to beginning
- *     4. Read character by character:
- *        - Count newlines for lines
- *        - Track whitespace transitions for word counting
- *        - Increment character count
- *     5. Close file and return results
+ * Maps the whole file with CreateFileMappingA/MapViewOfFile and hands the
+ * view to count_buffer. Characters are counted as raw bytes.
  *
  * Parameters:
  *     filename - Path to the file to analyze
@@ -132,41 +398,103 @@ void output_error_json(const char *error_msg) {
  *     0 on success, -1 on failure (file not found/readable)
  */
 int analyze_file(const char *filename, FileStats *stats) {
-    FILE *file = fopen(filename, "r");
-    if (file == NULL) {
+    HANDLE file = CreateFileA(filename, GENERIC_READ, FILE_SHARE_READ, NULL,
+                              OPEN_EXISTING, FILE_FLAG_SEQUENTIAL_SCAN, NULL);
+    if (file == INVALID_HANDLE_VALUE) {
         return -1;
     }
 
-    // Get file size first using fseek/ftell
-    fseek(file, 0, SEEK_END);
-    stats->size_bytes = ftell(file);
-    rewind(file);  // Reset to start for analysis
+    LARGE_INTEGER size;
+    if (!GetFileSizeEx(file, &size)) {
+        CloseHandle(file);
+        return -1;
+    }
 
-    // Initialize statistics to zero
-    stats->lines = 0;
-    stats->words = 0;
-    stats->characters = 0;
-    strncpy(stats->filename, filename, sizeof(stats->filename) - 1);
-    stats->filename[sizeof(stats->filename) - 1] = '\0';
+    init_stats(stats, filename);
+    stats->size_bytes = (long)size.QuadPart;
 
-    int ch;
-    int in_word = 0;  // Track whether we're currently inside a word
+    // Empty files cannot be mapped and have nothing to count
+    if (size.QuadPart == 0) {
+        CloseHandle(file);
+        return 0;
+    }
 
-    // Character-by-character analysis for accurate counting
-    while ((ch = fgetc(file)) != EOF) {
-        stats->characters++;
+    HANDLE mapping = CreateFileMappingA(file, NULL, PAGE_READONLY, 0, 0, NULL);
+    const unsigned char *addr = mapping ? MapViewOfFile(mapping, FILE_MAP_READ, 0, 0, 0) : NULL;
+    if (addr == NULL) {
+        if (mapping) {
+            CloseHandle(mapping);
+        }
+        CloseHandle(file);
+        return -1;
+    }
 
-        // Count line breaks
-        if (ch == '\n') {
-            stats->lines++;
+    int prev_space = 1;  // The start of the file behaves like whitespace
+    count_buffer(addr, (size_t)size.QuadPart, stats, &prev_space);
+
+    UnmapViewOfFile(addr);
+    CloseHandle(mapping);
+    CloseHandle(file);
+    return 0;
+}
+#else
+/**
+ * Analyze an open text file and compute statistics.
+ *
+ * Memory-maps the file and hands the mapping to count_buffer to count
+ * lines, words, and characters, avoiding the kernel-to-user copies of
+ * buffered reads. Uses fstat to determine file size.
+ *
+ * Algorithm:
+ *     1. fstat the descriptor to get file size
+ *     2. mmap the whole file read-only and advise sequential access
+ *     3. Scan the mapping once:
+ *        - Count newlines for lines
+ *        - Track whitespace transitions for word counting
+ *        - Add the mapping length to the character count
+ *     4. Unmap, close the descriptor and return results
+ *
+ *     Files that cannot be mapped (pipes, special files, mmap failure) are
+ *     read in READ_CHUNK pieces instead.
+ *
+ * Parameters:
+ *     fd       - Descriptor opened for reading (closed by this function)
+ *     filename - Path reported in the results
+ *     stats    - Pointer to FileStats structure to populate
+ *
+ * Returns:
+ *     0 on success, -1 on failure (descriptor not stat-able)
+ */
+int analyze_fd(int fd, const char *filename, FileStats *stats) {
+    struct stat st;
+    if (fstat(fd, &st) != 0) {
+        close(fd);
+        return -1;
+    }
+
+    init_stats(stats, filename);
+    stats->size_bytes = (long)st.st_size;
+
+    int prev_space = 1;  // The start of the file behaves like whitespace
+    int mapped = 0;
+
+    if (S_ISREG(st.st_mode) && st.st_size > 0) {
+        size_t size = (size_t)st.st_size;
+        void *addr = mmap(NULL, size, PROT_READ, MAP_PRIVATE, fd, 0);
+        if (addr != MAP_FAILED) {
+            posix_madvise(addr, size, POSIX_MADV_SEQUENTIAL);
+            count_buffer(addr, size, stats, &prev_space);
+            munmap(addr, size);
+            mapped = 1;
         }
+    }
 
-        // Word counting: transition from whitespace to non-whitespace
-        if (isspace(ch)) {
-            in_word = 0;  // Exiting a word
-        } else if (!in_word) {
-            in_word = 1;  // Entering a new word
-            stats->words++;
+    if (!mapped) {
+        // Fallback: chunked reads; the kernels keep word state across chunks
+        static unsigned char buffer[READ_CHUNK];
+        ssize_t got;
+        while ((got = read(fd, buffer, sizeof(buffer))) > 0) {
+            count_buffer(buffer, (size_t)got, stats, &prev_space);
         }
     }
 
@@ -177,7 +505,192 @@ int analyze_file(const char *filename, FileStats *stats) {
         // NOTE: The original logic is intentionally conservative; keep as-is.
     }
 
-    fclose(file);
+    close(fd);
+    return 0;
+}
+
+/**
+ * Analyze a text file by path.
+ *
+ * Parameters:
+ *     filename - Path to the file to analyze
+ *     stats    - Pointer to FileStats structure to populate
+ *
+ * Returns:
+ *     0 on success, -1 on failure (file not found/readable)
+ */
+int analyze_file(const char *filename, FileStats *stats) {
+    int fd = open(filename, O_RDONLY);
+    if (fd < 0) {
+        return -1;
+    }
+    return analyze_fd(fd, filename, stats);
+}
+#endif
+
+/**
+ * Return non-zero if path names an existing directory.
+ */
+int is_directory(const char *path) {
+    struct stat st;
+    return stat(path, &st) == 0 && S_ISDIR(st.st_mode);
+}
+
+/* ============================================================
+ * BATCH ANALYSIS FUNCTIONS
+ * ============================================================ */
+
+/**
+ * Emit one array element per regular file directly inside a directory.
+ *
+ * Entries are enumerated with readdir and checked with fstatat relative
+ * to the directory fd (symlinks are not followed, subdirectories are not
+ * descended into), then opened with openat. This clusters all metadata
+ * lookups on one already-resolved directory instead of walking the full
+ * path again for every file.
+ *
+ * Parameters:
+ *     dirname - Directory to scan
+ *     compact - Non-zero when the whole array is kept on one line
+ *     count   - Number of array elements printed so far
+ *
+ * Returns:
+ *     None (outputs to stdout)
+ */
+void emit_directory(const char *dirname, int compact, int *count) {
+#ifdef _WIN32
+    begin_array_element(compact, count);
+    output_error_json("Directory analysis is not supported on this platform", dirname, 1);
+#else
+    DIR *dir = opendir(dirname);
+    if (dir == NULL) {
+        begin_array_element(compact, count);
+        output_error_json("Unable to open directory", dirname, 1);
+        return;
+    }
+
+    int dfd = dirfd(dir);
+    size_t dir_len = strlen(dirname);
+    const char *sep = (dir_len > 0 && dirname[dir_len - 1] == '/') ? "" : "/";
+    struct dirent *entry;
+
+    while ((entry = readdir(dir)) != NULL) {
+        struct stat st;
+        if (fstatat(dfd, entry->d_name, &st, AT_SYMLINK_NOFOLLOW) != 0 || !S_ISREG(st.st_mode)) {
+            continue;  // Skips ".", "..", subdirectories, symlinks and special files
+        }
+
+        begin_array_element(compact, count);
+
+        // The joined path is only reported (openat works from dfd), so an
+        // overlong one is cut short like any other reported filename
+        char path[PATH_MAX];
+        snprintf(path, sizeof(path), "%s%s%s", dirname, sep, entry->d_name);
+
+        FileStats stats;
+        int fd = openat(dfd, entry->d_name, O_RDONLY);
+        if (fd < 0 || analyze_fd(fd, path, &stats) != 0) {
+            output_error_json("Unable to open file", path, 1);
+            continue;
+        }
+
+        output_langgraph_json(&stats, 1);
+    }
+
+    closedir(dir);
+#endif
+}
+
+/**
+ * Analyze several paths and print the results as one JSON array.
+ *
+ * Files contribute one element each; directories contribute one element
+ * per regular file they contain. Failures become error elements so the
+ * array always describes every requested path. Elements are always single
+ * line objects; compact only controls whether they share one line.
+ *
+ * Parameters:
+ *     paths   - Paths to analyze
+ *     n       - Number of paths
+ *     compact - Non-zero to keep the whole array on one line (--serve mode)
+ *
+ * Returns:
+ *     None (outputs to stdout)
+ */
+void output_batch_json(char *const paths[], int n, int compact) {
+    int count = 0;
+
+    printf("[");
+    for (int i = 0; i < n; i++) {
+        if (is_directory(paths[i])) {
+            emit_directory(paths[i], compact, &count);
+            continue;
+        }
+
+        FileStats stats;
+        begin_array_element(compact, &count);
+        if (analyze_file(paths[i], &stats) != 0) {
+            output_error_json("Unable to open file", paths[i], 1);
+        } else {
+            output_langgraph_json(&stats, 1);
+        }
+    }
+    printf((compact || count == 0) ? "]\n" : "\n]\n");
+}
+
+/* ============================================================
+ * SERVE MODE
+ * ============================================================ */
+
+/**
+ * Answer newline-delimited path requests until stdin is closed.
+ *
+ * Exactly one JSON line is written per request line, so the caller can
+ * pair requests and responses by order alone. A file yields an object and
+ * a directory yields an array of objects.
+ *
+ * Returns:
+ *     0 when stdin reaches EOF
+ */
+int serve(void) {
+    char line[SERVE_LINE_MAX];
+
+    while (fgets(line, sizeof(line), stdin) != NULL) {
+        size_t len = strlen(line);
+
+        if (len > 0 && line[len - 1] != '\n' && !feof(stdin)) {
+            // Overlong request: drain the rest of the line, then report it
+            int ch;
+            while ((ch = getchar()) != EOF && ch != '\n') {
+            }
+            output_error_json("Path too long", NULL, 1);
+            printf("\n");
+            fflush(stdout);
+            continue;
+        }
+
+        // Strip the trailing newline (and carriage return from Windows callers)
+        while (len > 0 && (line[len - 1] == '\n' || line[len - 1] == '\r')) {
+            line[--len] = '\0';
+        }
+
+        FileStats stats;
+        char *paths[1] = {line};
+        if (len == 0) {
+            output_error_json("Empty path", NULL, 1);
+            printf("\n");
+        } else if (is_directory(line)) {
+            output_batch_json(paths, 1, 1);
+        } else if (analyze_file(line, &stats) != 0) {
+            output_error_json("Unable to open file", line, 1);
+            printf("\n");
+        } else {
+            output_langgraph_json(&stats, 1);
+            printf("\n");
+        }
+        fflush(stdout);
+    }
+
     return 0;
 }
 
@@ -186,17 +699,30 @@ int analyze_file(const char *filename, FileStats *stats) {
  * ============================================================ */
 
 int main(int argc, char *argv[]) {
-    if (argc != 2) {
-        output_error_json("Usage: file_stats <filename>");
+    if (argc < 2) {
+        output_error_json("Usage: file_stats <path> [<path> ...] | file_stats --serve", NULL, 0);
+        printf("\n");
         return 1;
     }
 
+    if (argc == 2 && strcmp(argv[1], "--serve") == 0) {
+        return serve();
+    }
+
+    // Several paths or a directory: one JSON array covering every file
+    if (argc > 2 || is_directory(argv[1])) {
+        output_batch_json(&argv[1], argc - 1, 0);
+        return 0;
+    }
+
     FileStats stats;
     if (analyze_file(argv[1], &stats) != 0) {
-        output_error_json("Unable to open file");
+        output_error_json("Unable to open file", NULL, 0);
+        printf("\n");
         return 1;
     }
 
-    output_langgraph_json(&stats);
+    output_langgraph_json(&stats, 0);
+    printf("\n");
     return 0;
 }
@@ -8,16 +8,20 @@ Description:
     LangGraph-compatible wrapper around a small C executable (`file_stats`)
     used for fast file-level analytics. This tool enables an agent to run
     system-level text inspection (lines / words / characters / size) and
-    return structured JSON results to the model.
+    return structured JSON results to the model. Many files (or whole
+    directories) are analyzed in a single C call rather than one per file.
 
 Highlights:
     • Cross-platform execution (Windows/Linux/Docker)
-    • Subprocess-based integration with a compiled C binary
+    • Subprocess-based integration with a compiled C binary (sync and asyncio)
+    • Async calls reuse one resident `file_stats --serve` process over a pipe
+      (`query_file_stats`, also used by the backend graph)
     • JSON output for reliable parsing and downstream reasoning
     • Defensive error handling (timeouts, decoding failures)
 
 Requirements:
     - langchain-core
+    - orjson
     - pathlib
 
 Local build (example):
@@ -25,32 +29,264 @@ Local build (example):
     Linux/Mac: gcc -o file_stats file_stats.c
 
 Standalone test:
-    python file_stats_tool.py <filename>
+    python file_stats_tool.py <filename> [<filename> ...]
 """
 
 # ============================================================
 # IMPORTS
 # ============================================================
 
+import asyncio
 import json
+import stat
 import subprocess
+import orjson
 from pathlib import Path
 import os
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool
+
+# Seconds to wait for the C tool before giving up
+TOOL_TIMEOUT = float(os.getenv("FILE_STATS_TIMEOUT", "10"))
+
+# Spawn options for the C tool. close_fds=False (with no preexec_fn/cwd) lets
+# CPython start it with posix_spawn rather than fork+exec, which avoids copying
+# the page tables of a large Python process. Python-created fds are
+# non-inheritable by default (PEP 446), so nothing extra leaks to the child.
+_SPAWN_KWARGS = {"close_fds": False}
+
+# Longest reply line accepted from `file_stats --serve`. A directory comes back
+# as one JSON array line (~150 bytes per file), so asyncio's default 64 KiB
+# readline limit would reject directories of a few hundred files.
+_SERVE_LINE_LIMIT = 64 * 1024 * 1024
+
+# Resident `file_stats --serve` process shared by every async caller in the
+# process (this tool and the backend graph). Requests are answered strictly in
+# order, so the lock keeps each write/readline pair together. The process
+# exits on its own when our end of stdin closes. The process, its pipes and
+# the lock belong to the event loop that created them (_stats_loop); another
+# loop gets its own.
+_stats_proc = None
+_stats_proc_path = None
+_stats_keeper = None
+_stats_loop = None
+_stats_lock = None
+
+# ============================================================
+# HELPERS
+# ============================================================
+
+def _tool_path() -> Path:
+    """Locate the compiled executable (Windows uses .exe; Unix-like systems typically do not)."""
+    binary = "file_stats.exe" if os.name == "nt" else "file_stats"
+    return (Path(__file__).parent / binary).resolve()
+
+
+def _parse_output(returncode: int, stdout: bytes, stderr: bytes) -> dict | list:
+    """Turn the C tool's exit code and raw output streams into a result dict (or list of dicts)."""
+    # Check if execution was successful
+    if returncode == 0 and stdout.strip():
+        try:
+            # The C tool escapes strings itself, so its output is valid JSON as-is;
+            # orjson parses the raw bytes directly (no decode step needed)
+            return orjson.loads(stdout)
+        except orjson.JSONDecodeError as e:
+            return {
+                "error": "Invalid JSON output from tool",
+                "raw_output": stdout.decode(errors="replace").strip(),
+                "status": "error",
+                "decode_error": str(e)
+            }
+    else:
+        return {"error": f"Tool failed: {stderr.decode(errors='replace').strip()}", "status": "error"}
+
+
+def _as_list(result: dict | list) -> list[dict]:
+    """Normalize a single result object or an array of results to a list."""
+    return result if isinstance(result, list) else [result]
+
+
+def _precheck(file_paths: list[str]) -> list[dict] | None:
+    """
+    Answer a request from os.stat alone when none of its paths needs the C tool.
+
+    Missing paths and empty regular files get the same entries the C tool
+    would produce. As soon as one path has content to analyze, None is
+    returned and the whole request goes to the C tool, which keeps results
+    in request order and costs a single call either way.
+    """
+    results = []
+    for path in file_paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            results.append({
+                "tool": "file_stats",
+                "filename": path,
+                "error": "Unable to open file",
+                "status": "error"
+            })
+            continue
+        if not (stat.S_ISREG(st.st_mode) and st.st_size == 0):
+            return None
+        results.append({
+            "tool": "file_stats",
+            "filename": path,
+            "lines": 0,
+            "words": 0,
+            "characters": 0,
+            "size_bytes": 0,
+            "status": "success"
+        })
+    return results
+
+
+def _stats_lock_for_running_loop() -> asyncio.Lock:
+    """Return the request lock for the running loop, dropping a process left by another loop."""
+    global _stats_loop, _stats_lock
+    loop = asyncio.get_running_loop()
+    if loop is not _stats_loop:
+        _reset_stats_proc()
+        _stats_loop = loop
+        _stats_lock = asyncio.Lock()
+    return _stats_lock
+
+
+async def _keep_stats_proc(proc) -> None:
+    """
+    Hold the resident C tool until it is cancelled, then shut it down.
+
+    Cancelled by _reset_stats_proc, or by asyncio.run() before it closes the
+    loop. Either way the process is killed, unread output is drained (a
+    paused stdout pipe would keep wait() from returning) and the process is
+    reaped while the loop that owns its pipes is still running.
+    """
+    try:
+        await asyncio.Event().wait()
+    finally:
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+        proc.stdin.close()
+        await proc.stdout.read()
+        await proc.wait()
+
+
+async def _ensure_stats_proc(tool_path: str):
+    """Start the resident C tool if it is not running yet (or has exited, or is another binary)."""
+    global _stats_proc, _stats_proc_path, _stats_keeper
+    if _stats_proc is not None and _stats_proc_path != tool_path:
+        _reset_stats_proc()
+    if _stats_proc is None or _stats_proc.returncode is not None:
+        _reset_stats_proc()
+        _stats_proc = await asyncio.create_subprocess_exec(
+            tool_path,
+            "--serve",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=_SERVE_LINE_LIMIT,
+            **_SPAWN_KWARGS,
+        )
+        _stats_proc_path = tool_path
+        _stats_keeper = asyncio.create_task(_keep_stats_proc(_stats_proc))
+    return _stats_proc
+
+
+def _reset_stats_proc() -> None:
+    """Stop the resident C tool so the next request starts a fresh one."""
+    global _stats_proc, _stats_keeper
+    if _stats_keeper is not None and not _stats_keeper.get_loop().is_closed():
+        # The keeper kills, drains and reaps the process on its own loop
+        _stats_keeper.cancel()
+    elif _stats_proc is not None and _stats_proc.returncode is None:
+        try:
+            _stats_proc.kill()
+        except ProcessLookupError:
+            pass
+    _stats_proc = None
+    _stats_keeper = None
+
+
+async def _stats_request(proc, file_paths: list[str]) -> list[bytes]:
+    """
+    Send all paths to the resident C tool and read back one JSON line per path.
+
+    The paths are written by a separate task while the replies are read, so
+    a batch larger than the pipe buffers cannot leave both sides blocked on
+    a full pipe.
+    """
+    async def send() -> None:
+        proc.stdin.write(b"".join(os.fsencode(p) + b"\n" for p in file_paths))
+        await proc.stdin.drain()
+
+    sender = asyncio.create_task(send())
+    try:
+        lines = []
+        for _ in file_paths:
+            line = await proc.stdout.readline()
+            if not line:
+                break
+            lines.append(line)
+    finally:
+        sender.cancel()
+        # A process that died mid-batch also breaks the pipe; the short
+        # reply count already reports that
+        await asyncio.gather(sender, return_exceptions=True)
+    return lines
+
+
+async def query_file_stats(file_paths: list[str], tool_path: str | None = None) -> list[bytes]:
+    """
+    Ask the resident `file_stats --serve` process about a batch of paths.
+
+    Batches made only of missing or empty files are answered from os.stat
+    (see `_precheck`) without touching the process. Otherwise `tool_path`
+    selects the executable (default: the one next to this module), which is
+    started, or restarted, on demand. Returns the raw JSON lines, one per
+    path (an array for a directory). Raises ValueError for
+    paths containing line breaks, asyncio.TimeoutError if the answers do not
+    arrive within TOOL_TIMEOUT, and RuntimeError if the process exits
+    mid-request.
+    """
+    if any("\n" in p or "\r" in p for p in file_paths):
+        raise ValueError("Filenames must not contain line breaks")
+
+    # Skip the pipe round trip (and daemon start) when no path has content
+    prechecked = _precheck(file_paths)
+    if prechecked is not None:
+        return [orjson.dumps(entry) for entry in prechecked]
+
+    tool_path = str(tool_path or _tool_path())
+
+    async with _stats_lock_for_running_loop():
+        proc = await _ensure_stats_proc(tool_path)
+        try:
+            lines = await asyncio.wait_for(_stats_request(proc, file_paths), timeout=TOOL_TIMEOUT)
+        except BaseException:
+            # Timeout or cancellation: a half-finished request would desync the next reply
+            _reset_stats_proc()
+            raise
+
+        if len(lines) != len(file_paths):
+            _reset_stats_proc()
+            raise RuntimeError("Tool exited unexpectedly")
+        return lines
 
 # ============================================================
 # TOOL DEFINITION
 # ============================================================
 
-@tool
-def analyze_file_statistics(filename: str) -> dict:
+def _analyze_file_statistics(filenames: list[str]) -> list[dict]:
     """
     Analyze text file statistics by invoking the compiled C tool.
 
     This function wraps a C-based file analysis program, enabling
     LangGraph agents to perform efficient file statistics operations.
-    The C program analyzes the file and returns results as JSON, which
-    this wrapper parses and returns to the agent.
+    All requested paths are handed to one C invocation; directories are
+    expanded to the regular files they directly contain. The C program
+    returns results as JSON, which this wrapper parses and returns to
+    the agent.
 
     The tool counts:
         • Lines (newline characters)
@@ -59,64 +295,97 @@ def analyze_file_statistics(filename: str) -> dict:
         • File size (bytes)
 
     Args:
-        filename: Path to the text file to analyze (relative or absolute)
+        filenames: Paths of text files or directories to analyze
+                   (relative or absolute)
 
     Returns:
-        dict: Dictionary containing file statistics if successful:
-              {
-                  "tool": "file_stats",
-                  "filename": "path/to/file.txt",
-                  "lines": 42,
-                  "words": 256,
-                  "characters": 1843,
-                  "size_bytes": 1890,
-                  "status": "success"
-              }
-
-              Or error information if analysis fails:
-              {
-                  "error": "Error message",
-                  "status": "error"
-              }
+        list[dict]: One dictionary per analyzed file, in request order:
+              [
+                  {
+                      "tool": "file_stats",
+                      "filename": "path/to/file.txt",
+                      "lines": 42,
+                      "words": 256,
+                      "characters": 1843,
+                      "size_bytes": 1890,
+                      "status": "success"
+                  },
+                  ...
+              ]
+
+              Files that cannot be analyzed appear as error entries; if the
+              tool itself fails the list holds a single error entry:
+              [
+                  {
+                      "error": "Error message",
+                      "status": "error"
+                  }
+              ]
     """
     try:
-        # Locate the compiled executable (Windows uses .exe; Unix-like systems typically do not)
-        binary = "file_stats.exe" if os.name == "nt" else "file_stats"
-        tool_path = (Path(__file__).parent / binary).resolve()
-        file_path = Path(filename).resolve()
+        tool_path = _tool_path()
+        file_paths = [str(Path(f).resolve()) for f in filenames]
+        if not file_paths:
+            return []
+
+        # Skip the process spawn when every path is missing or empty
+        prechecked = _precheck(file_paths)
+        if prechecked is not None:
+            return prechecked
 
-        # Run the C tool via subprocess and capture output
+        # Run the C tool once for every path and capture output
         result = subprocess.run(
-            [str(tool_path), str(file_path)],
+            [str(tool_path), *file_paths],
             capture_output=True,
-            text=True,
-            timeout=10
+            timeout=TOOL_TIMEOUT,
+            **_SPAWN_KWARGS
         )
+        return _as_list(_parse_output(result.returncode, result.stdout, result.stderr))
+
+    except subprocess.TimeoutExpired:
+        return [{"error": "Tool execution timed out", "status": "error"}]
+    except Exception as e:
+        return [{"error": f"Integration error: {str(e)}", "status": "error"}]
 
-        # Clean up stdout and stderr for parsing
-        stdout_clean = result.stdout.strip()
-        stderr_clean = result.stderr.strip()
 
-        # Check if execution was successful
-        if result.returncode == 0 and stdout_clean:
-            try:
-                # Escape backslashes for valid JSON (Windows path compatibility)
-                stdout_clean = stdout_clean.replace("\\", "\\\\")
-                return json.loads(stdout_clean)
-            except json.JSONDecodeError as e:
-                return {
-                    "error": "Invalid JSON output from tool",
-                    "raw_output": stdout_clean,
-                    "status": "error",
-                    "decode_error": str(e)
-                }
-        else:
-            return {"error": f"Tool failed: {stderr_clean}", "status": "error"}
+async def _aanalyze_file_statistics(filenames: list[str]) -> list[dict]:
+    """
+    Async variant of `_analyze_file_statistics`.
+
+    Pipelines the paths to a resident `file_stats --serve` process over a
+    pipe (see `query_file_stats`), so callers running inside an event loop
+    (e.g., a LangGraph server) are neither blocked nor charged a process
+    spawn per call. Returns the same list shape as the synchronous tool.
+    """
+    try:
+        file_paths = [str(Path(f).resolve()) for f in filenames]
+        if not file_paths:
+            return []
+
+        try:
+            lines = await query_file_stats(file_paths)
+        except asyncio.TimeoutError:
+            return [{"error": "Tool execution timed out", "status": "error"}]
+        except (ValueError, RuntimeError) as e:
+            return [{"error": str(e), "status": "error"}]
+
+        results = []
+        for line in lines:
+            results.extend(_as_list(_parse_output(0, line, b"")))
+        return results
 
-    except subprocess.TimeoutExpired:
-        return {"error": "Tool execution timed out", "status": "error"}
     except Exception as e:
-        return {"error": f"Integration error: {str(e)}", "status": "error"}
+        return [{"error": f"Integration error: {str(e)}", "status": "error"}]
+
+
+# Build the tool from both entry points so `analyze_file_statistics.ainvoke(...)`
+# runs the native coroutine instead of the sync function in a thread pool.
+# The description comes from the sync function's docstring.
+analyze_file_statistics = StructuredTool.from_function(
+    func=_analyze_file_statistics,
+    coroutine=_aanalyze_file_statistics,
+    name="analyze_file_statistics",
+)
 
 # ============================================================
 # STANDALONE TEST PROGRAM
@@ -126,14 +395,14 @@ if __name__ == "__main__":
     import sys
 
     # Validate command-line arguments
-    if len(sys.argv) != 2:
-        print("Usage: python file_stats_tool.py <filename>")
+    if len(sys.argv) < 2:
+        print("Usage: python file_stats_tool.py <filename> [<filename> ...]")
         sys.exit(1)
 
-    # Execute tool with provided filename
-    result = analyze_file_statistics.invoke({"filename": sys.argv[1]})
+    # Execute tool with provided filenames
+    result = analyze_file_statistics.invoke({"filenames": sys.argv[1:]})
 
-    # Display formatted results
+    # Display formatted results (stdlib json is fine for one-off pretty-printing)
     print("LangGraph Tool Result:")
     print(json.dumps(result, indent=2))
 